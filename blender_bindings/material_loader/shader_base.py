@@ -1,6 +1,6 @@
 from pathlib import Path
 import sys
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import bpy
 import numpy as np
@@ -114,6 +114,7 @@ logger = log_manager.get_logger('MaterialLoader')
 
 
 class ShaderBase:
+    __slots__ = ('logger', 'bpy_material', 'do_arrange', 'uv_map')
     SHADER: str = "Unknown"
     use_bvlg_status = True
 
@@ -247,6 +248,11 @@ class ShaderBase:
     def connect_nodes(self, output_socket, input_socket):
         self.bpy_material.node_tree.links.new(output_socket, input_socket)
 
+    def connect_nodes_batch(self, links: List[Tuple[bpy.types.NodeSocket, bpy.types.NodeSocket]]):
+        links_new = self.bpy_material.node_tree.links.new
+        for output_socket, input_socket in links:
+            links_new(output_socket, input_socket)
+
     def insert_node(self, output_socket, middle_input_socket, middle_output_socket):
         receivers = []
         for link in output_socket.links:
@@ -1,8 +1,9 @@
 # from pprint import pformat
 
 import bpy
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, Union, Tuple
 import numpy as np
 
 from ..shader_base import ShaderBase
@@ -14,12 +15,44 @@ from ....library.shared.content_providers.content_manager import ContentManager
 logger = SLoggingManager().get_logger("Source2::Shader")
 
 
+def _set_non_color(image: bpy.types.Image):
+    image.colorspace_settings.is_data = True
+    image.colorspace_settings.name = 'Non-Color'
+
+
+@lru_cache(maxsize=512)
+def _load_texture_cached(proper_path: Path, texture_name: str, default_color: Tuple[float, ...], raw_texture: bool):
+    texture = Source2ShaderBase.import_vtex(proper_path)
+    if texture is None:
+        texture = ShaderBase.get_missing_texture(f'missing_{texture_name}', default_color)
+    if raw_texture:
+        _set_non_color(texture)
+    return texture
+
+
+def _is_image_alive(image: bpy.types.Image) -> bool:
+    try:
+        return image.name in bpy.data.images
+    except ReferenceError:
+        return False
+
+
+def clear_texture_cache():
+    """Drop cached texture references, must be called once an import finishes."""
+    _load_texture_cached.cache_clear()
+
+
 class Source2ShaderBase(ShaderBase):
+    __slots__ = ('_material_data', 'resources', '_texture_map')
+
     def __init__(self, source2_material, resources: Dict[Union[str, int], Path]):
         super().__init__()
         self._material_data: Dict[str, Any] = source2_material
         # logger.print(pformat(self._material_data))
         self.resources: Dict[Union[str, int], Path] = resources
+        self._texture_map: Dict[str, Union[str, int]] = {}
+        for param in self._material_data.get('m_textureParams', []):
+            self._texture_map.setdefault(param['m_name'], param['m_pValue'])
 
     def _get_param(self, param_type, name, value_type, default):
         for param in self._material_data[param_type]:
@@ -27,13 +60,26 @@ class Source2ShaderBase(ShaderBase):
                 return param[value_type]
         return default
 
-    def load_texture_or_default(self, file: str, default_color: tuple = (1.0, 1.0, 1.0, 1.0)):
+    def load_texture_or_default(self, file: str, default_color: tuple = (1.0, 1.0, 1.0, 1.0),
+                                raw_texture: bool = False):
         print(f'Loading texture {file}')
         if isinstance(file, int):
             file = self.resources.get(file, str(file))
             file = {v: k for k, v in self.resources.items() if not isinstance(k, int)}[file]
             print(f'Remapped to {file}')
-        return super().load_texture_or_default(file, default_color)
+        proper_path = self.resources.get(file, None)
+        if proper_path is None:
+            texture = super().load_texture_or_default(file, default_color)
+            if raw_texture:
+                _set_non_color(texture)
+            return texture
+
+        args = proper_path, Path(file).stem, tuple(default_color), raw_texture
+        texture = _load_texture_cached(*args)
+        if not _is_image_alive(texture):
+            clear_texture_cache()
+            texture = _load_texture_cached(*args)
+        return texture
 
     def get_int(self, name, default):
         return self._get_param('m_intParams', name, 'm_nValue', default)
@@ -45,8 +91,7 @@ class Source2ShaderBase(ShaderBase):
         return self._get_param('m_vectorParams', name, 'm_value', default)
 
     def get_texture(self, name, default):
-        param = self._get_param('m_textureParams', name, 'm_pValue', default)
-        return param
+        return self._texture_map.get(name, default)
 
     def get_dynamic(self, name, default):
         return self._get_param('m_dynamicParams', name, 'error', default)
@@ -78,11 +123,15 @@ class Source2ShaderBase(ShaderBase):
         image['normalmap_converted'] = True
         return image, roughness_texture
 
+    @staticmethod
+    def import_vtex(proper_path: Path):
+        texture_path = ContentManager().find_file(proper_path)
+        if texture_path:
+            texture = ValveCompiledTextureLoader(texture_path)
+            return texture.import_texture(proper_path.stem, True)
+        return None
+
     def load_texture(self, texture_name, texture_path):
         if texture_path in self.resources:
-            proper_path = self.resources[texture_path]
-            texture_path = ContentManager().find_file(proper_path)
-            if texture_path:
-                texture = ValveCompiledTextureLoader(texture_path)
-                return texture.import_texture(proper_path.stem, True)
+            return self.import_vtex(self.resources[texture_path])
         return None
@@ -1,107 +1,161 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import bpy
 import numpy as np
 
 from ..source2_shader_base import Source2ShaderBase
 from ...shader_base import Nodes
 
+# material parameter name -> _VRParams field, shared by int and vector params
+_PARAM_FIELDS = {
+    'g_vColorTint': 'color_tint',
+    'g_vGlossinessRange': 'glossiness',
+    'F_ALPHA_TEST': 'alpha_test',
+    'F_METALNESS_TEXTURE': 'metalness',
+    'F_TRANSLUCENT': 'translucent',
+}
+_TEX_IMAGE = Nodes.ShaderNodeTexImage
+_MIX_RGB = Nodes.ShaderNodeMixRGB
+_NORMAL_MAP = Nodes.ShaderNodeNormalMap
+_BSDF = Nodes.ShaderNodeBsdfPrincipled
+_OUT = Nodes.ShaderNodeOutputMaterial
+
+_WHITE = np.ones(4, dtype=np.float32)
+_ONES3 = np.ones(3, dtype=np.float32)
+_DEFAULT_GLOSS = (0.0, 1.0, 0.0, 0.0)
+_EARLY_EXIT = frozenset(('UNKNOWN', 'LOADED'))
+_ALPHA_BLEND = ('Alpha', 'HASHED', 'HASHED')
+# (translucent << 2 | alpha_test << 1 | metalness) -> (albedo alpha target socket, blend_method, shadow_method)
+_ALPHA_DISPATCH = (
+    None,
+    ('Metallic', None, None),
+    _ALPHA_BLEND, _ALPHA_BLEND, _ALPHA_BLEND, _ALPHA_BLEND, _ALPHA_BLEND, _ALPHA_BLEND,
+)
+_PARAM_SOURCES = (
+    ('m_intParams', 'm_nValue'),
+    ('m_vectorParams', 'm_value'),
+)
+
+
+@dataclass
+class _VRParams:
+    __slots__ = ('color_tex', 'normal_tex', 'color_tint', 'alpha_test', 'metalness', 'translucent', 'glossiness')
+    color_tex: Optional[Union[str, int]]
+    normal_tex: Optional[Union[str, int]]
+    color_tint: np.ndarray
+    alpha_test: int
+    metalness: int
+    translucent: int
+    glossiness: Tuple[float, float]
+
+
+@dataclass
+class TextureRequest:
+    node: bpy.types.ShaderNodeTexImage
+    texture_path: Union[str, int]
+    default_color: Tuple[float, float, float, float]
+    raw_texture: bool = False
+    normal_map: bool = False
+
 
 class VRGeneric(Source2ShaderBase):
+    __slots__ = ('_params',)
     SHADER: str = 'vr_standard.vfx'
 
-    @property
-    def color_texture(self):
-        texture_path = self.get_texture('g_tColor', None)
-        if texture_path is not None:
-            image = self.load_texture_or_default(texture_path, (0.3, 0.3, 0.3, 1.0))
-            return image
-        return None
-
-    @property
-    def ambient_occlusion(self):
-        texture_path = self.get_texture('g_tAmbientOcclusion', None)
-        if texture_path is not None:
-            image = self.load_texture_or_default(texture_path, (1.0, 1.0, 1.0, 1.0))
-            image.colorspace_settings.is_data = True
-            image.colorspace_settings.name = 'Non-Color'
-            return image
-        return None
-
-    @property
-    def normal_texture(self):
-        texture_path = self.get_texture('g_tNormal', None)
-        if texture_path is not None:
-            image = self.load_texture_or_default(texture_path, (0.5, 0.5, 1.0, 1.0))
-            image.colorspace_settings.is_data = True
-            image.colorspace_settings.name = 'Non-Color'
-            image, roughness = self.split_normal(image)
-            return image, roughness
-        return None, None
-
-    @property
-    def color(self):
-        return self.get_vector('g_vColorTint', np.ones(4, dtype=np.float32))
-
-    @property
-    def alpha_test(self):
-        return self.get_int('F_ALPHA_TEST', 0)
-
-    @property
-    def metalness(self):
-        return self.get_int('F_METALNESS_TEXTURE', 0)
-
-    @property
-    def translucent(self):
-        return self.get_int('F_TRANSLUCENT', 0)
-
-    @property
-    def specular(self):
-        return self.get_vector('g_vGlossinessRange', [0, 1, 0, 0])[0]
-
-    @property
-    def roughness(self):
-        return self.get_vector('g_vGlossinessRange', [0, 1, 0, 0])[1]
+    def __init__(self, source2_material, resources: Dict[Union[str, int], Path]):
+        super().__init__(source2_material, resources)
+        self._params: Optional[_VRParams] = None
+
+    def _load_params(self) -> _VRParams:
+        if self._params is not None:
+            return self._params
+        values = {}
+        for param_type, value_type in _PARAM_SOURCES:
+            for param in self._material_data[param_type]:
+                field = _PARAM_FIELDS.get(param['m_name'], None)
+                if field is not None and field not in values:
+                    values[field] = param[value_type]
+        glossiness = values.get('glossiness', _DEFAULT_GLOSS)
+        color_tint = np.array(values.get('color_tint', _WHITE), dtype=np.float32)
+        if color_tint[:3].sum() > 3.0:
+            # Tint stored in 0-255 range
+            color_tint /= np.float32(255)
+        self._params = _VRParams(
+            color_tex=self.get_texture('g_tColor', None),
+            normal_tex=self.get_texture('g_tNormal', None),
+            color_tint=color_tint,
+            alpha_test=values.get('alpha_test', 0),
+            metalness=values.get('metalness', 0),
+            translucent=values.get('translucent', 0),
+            glossiness=(float(glossiness[0]), float(glossiness[1])),
+        )
+        return self._params
+
+    def _resolve_textures(self, requests: List[TextureRequest]):
+        for request in requests:
+            image = self.load_texture_or_default(request.texture_path, request.default_color,
+                                                 raw_texture=request.raw_texture)
+            if request.normal_map:
+                image, _ = self.split_normal(image)
+            request.node.image = image
 
     def create_nodes(self, material_name):
-        if super().create_nodes(material_name) in ['UNKNOWN', 'LOADED']:
+        if super().create_nodes(material_name) in _EARLY_EXIT:
             return
 
-        material_output = self.create_node(Nodes.ShaderNodeOutputMaterial)
-        shader = self.create_node(Nodes.ShaderNodeBsdfPrincipled, self.SHADER)
-        self.connect_nodes(shader.outputs['BSDF'], material_output.inputs['Surface'])
-        shader.inputs['Roughness'].default_value = self.roughness
-        shader.inputs['Specular'].default_value = self.specular
-        color_texture = self.color_texture
-        normal_texture, roughness_texture = self.normal_texture
+        params = self._load_params()
+        color = params.color_tint
+        texture_requests: List[TextureRequest] = []
+        links = []
+
+        material_output = self.create_node(_OUT)
+        shader = self.create_node(_BSDF, self.SHADER)
+        links.append((shader.outputs['BSDF'], material_output.inputs['Surface']))
+        specular, roughness = params.glossiness
+        shader.inputs['Roughness'].default_value = roughness
+        shader.inputs['Specular'].default_value = specular
 
-        albedo_node = self.create_node(Nodes.ShaderNodeTexImage, 'albedo')
-        albedo_node.image = color_texture
+        albedo_node = self.create_node(_TEX_IMAGE, 'albedo')
+        if params.color_tex is not None:
+            texture_requests.append(TextureRequest(albedo_node, params.color_tex, (0.3, 0.3, 0.3, 1.0)))
 
-        if self.color[0] != 1.0 and self.color[1] != 1.0 and self.color[2] != 1.0:
-            color_mix = self.create_node(Nodes.ShaderNodeMixRGB)
+        if not np.array_equal(color[:3], _ONES3):
+            color_mix = self.create_node(_MIX_RGB)
             color_mix.blend_type = 'MULTIPLY'
-            self.connect_nodes(albedo_node.outputs['Color'], color_mix.inputs['Color1'])
-            color = self.color
-            if sum(color) > 3:
-                color = list(np.divide(color, 255))
-            color_mix.inputs['Color2'].default_value = color
+            links.append((albedo_node.outputs['Color'], color_mix.inputs['Color1']))
+            if bpy.app.version > (2, 83, 0):
+                color_mix.inputs['Color2'].default_value.foreach_set(color)
+            else:
+                color_mix.inputs['Color2'].default_value = color.tolist()
             color_mix.inputs['Fac'].default_value = 1.0
-            self.connect_nodes(color_mix.outputs['Color'], shader.inputs['Base Color'])
+            links.append((color_mix.outputs['Color'], shader.inputs['Base Color']))
         else:
-            self.connect_nodes(albedo_node.outputs['Color'], shader.inputs['Base Color'])
+            links.append((albedo_node.outputs['Color'], shader.inputs['Base Color']))
+
+        flags = bool(params.translucent) << 2 | bool(params.alpha_test) << 1 | bool(params.metalness)
+        alpha_target = _ALPHA_DISPATCH[flags]
+        if alpha_target is not None:
+            socket_name, blend_method, shadow_method = alpha_target
+            if blend_method is not None:
+                self.bpy_material.blend_method = blend_method
+                self.bpy_material.shadow_method = shadow_method
+            links.append((albedo_node.outputs['Alpha'], shader.inputs[socket_name]))
+
+        if params.normal_tex is not None:
+            normal_map_texture = self.create_node(_TEX_IMAGE, 'normal')
+            texture_requests.append(TextureRequest(normal_map_texture, params.normal_tex, (0.5, 0.5, 1.0, 1.0),
+                                                   raw_texture=True, normal_map=True))
 
-        if self.translucent or self.alpha_test:
-            self.bpy_material.blend_method = 'HASHED'
-            self.bpy_material.shadow_method = 'HASHED'
-            self.connect_nodes(albedo_node.outputs['Alpha'], shader.inputs['Alpha'])
-        elif self.metalness:
-            self.connect_nodes(albedo_node.outputs['Alpha'], shader.inputs['Metallic'])
+            normalmap_node = self.create_node(_NORMAL_MAP)
 
-        normal_map_texture = self.create_node(Nodes.ShaderNodeTexImage, 'normal')
-        normal_map_texture.image = normal_texture
+            links.append((normal_map_texture.outputs['Color'], normalmap_node.inputs['Color']))
+            links.append((normalmap_node.outputs['Normal'], shader.inputs['Normal']))
 
-        normalmap_node = self.create_node(Nodes.ShaderNodeNormalMap)
+        self.connect_nodes_batch(links)
 
-        self.connect_nodes(normal_map_texture.outputs['Color'], normalmap_node.inputs['Color'])
-        self.connect_nodes(normalmap_node.outputs['Normal'], shader.inputs['Normal'])
+        self._resolve_textures(texture_requests)
 
         # if self.selfillum:
         #     selfillummask = self.selfillummask
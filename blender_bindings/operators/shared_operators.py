@@ -10,6 +10,7 @@ from ..source1.mdl.model_loader import import_model_from_files
 from ..source1.mdl.v49.import_mdl import import_materials
 from ..source1.mdl import put_into_collections as s1_put_into_collections, FileImport
 from ..source2.vmdl.loader import put_into_collections as s2_put_into_collections, ValveCompiledModelLoader
+from ..material_loader.shaders.source2_shader_base import clear_texture_cache
 
 from ...library.source1.vtf import is_vtflib_supported
 from ...library.shared.content_providers.content_manager import ContentManager
@@ -30,6 +31,13 @@ class ChangeSkin_OT_LoadEntity(bpy.types.Operator):
     bl_options = {'UNDO'}
 
     def execute(self, context):
+        try:
+            self._load_entities(context)
+        finally:
+            clear_texture_cache()
+        return {'FINISHED'}
+
+    def _load_entities(self, context):
         content_manager = ContentManager()
         content_manager.deserialize(bpy.context.scene.get('content_manager_data', {}))
         unique_material_names = True
@@ -171,7 +179,6 @@ class ChangeSkin_OT_LoadEntity(bpy.types.Operator):
                                 print(f'Skin {skin} not found')
 
                     bpy.data.objects.remove(obj)
-        return {'FINISHED'}
 
 
 class SOURCEIO_OT_ChangeSkin(bpy.types.Operator):
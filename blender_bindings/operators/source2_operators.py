@@ -10,6 +10,7 @@ from ..source2.vmdl.loader import ValveCompiledModelLoader
 from ..source2.vwrld.loader import ValveCompiledWorldLoader
 from ..source2.vtex.loader import ValveCompiledTextureLoader
 from ..source2.vmat.loader import ValveCompiledMaterialLoader
+from ..material_loader.shaders.source2_shader_base import clear_texture_cache
 from ...library.shared.content_providers.content_manager import ContentManager
 from ...library.utils.math_utilities import SOURCE2_HAMMER_UNIT_TO_METERS
 
@@ -29,22 +30,24 @@ class SOURCEIO_OT_VMDLImport(bpy.types.Operator):
     filter_glob: StringProperty(default="*.vmdl_c", options={'HIDDEN'})
 
     def execute(self, context):
-
-        if Path(self.filepath).is_file():
-            directory = Path(self.filepath).parent.absolute()
-        else:
-            directory = Path(self.filepath).absolute()
-        ContentManager().scan_for_content(directory)
-        for n, file in enumerate(self.files):
-            print(f"Loading {n + 1}/{len(self.files)}")
-            model = ValveCompiledModelLoader(str(directory / file.name), self.scale)
-            model.load_mesh(self.invert_uv)
-            model.load_attachments()
-            master_collection = get_new_unique_collection(model.name, bpy.context.scene.collection)
-            put_into_collections(model.container, Path(model.name).stem, master_collection, False)
-
-            if self.import_anim:
-                model.load_animations()
+        try:
+            if Path(self.filepath).is_file():
+                directory = Path(self.filepath).parent.absolute()
+            else:
+                directory = Path(self.filepath).absolute()
+            ContentManager().scan_for_content(directory)
+            for n, file in enumerate(self.files):
+                print(f"Loading {n + 1}/{len(self.files)}")
+                model = ValveCompiledModelLoader(str(directory / file.name), self.scale)
+                model.load_mesh(self.invert_uv)
+                model.load_attachments()
+                master_collection = get_new_unique_collection(model.name, bpy.context.scene.collection)
+                put_into_collections(model.container, Path(model.name).stem, master_collection, False)
+
+                if self.import_anim:
+                    model.load_animations()
+        finally:
+            clear_texture_cache()
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -67,16 +70,18 @@ class SOURCEIO_OT_VWRLDImport(bpy.types.Operator):
     scale: FloatProperty(name="World scale", default=SOURCE2_HAMMER_UNIT_TO_METERS, precision=6)
 
     def execute(self, context):
-
-        if Path(self.filepath).is_file():
-            directory = Path(self.filepath).parent.absolute()
-        else:
-            directory = Path(self.filepath).absolute()
-        for n, file in enumerate(self.files):
-            print(f"Loading {n}/{len(self.files)}")
-            ContentManager().scan_for_content((directory.parent / file.name).with_suffix('.vpk'))
-            world = ValveCompiledWorldLoader(directory / file.name, invert_uv=self.invert_uv, scale=self.scale)
-            world.load(file.name)
+        try:
+            if Path(self.filepath).is_file():
+                directory = Path(self.filepath).parent.absolute()
+            else:
+                directory = Path(self.filepath).absolute()
+            for n, file in enumerate(self.files):
+                print(f"Loading {n}/{len(self.files)}")
+                ContentManager().scan_for_content((directory.parent / file.name).with_suffix('.vpk'))
+                world = ValveCompiledWorldLoader(directory / file.name, invert_uv=self.invert_uv, scale=self.scale)
+                world.load(file.name)
+        finally:
+            clear_texture_cache()
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -99,15 +104,18 @@ class SOURCEIO_OT_VPK_VWRLDImport(bpy.types.Operator):
     scale: FloatProperty(name="World scale", default=SOURCE2_HAMMER_UNIT_TO_METERS, precision=6)
 
     def execute(self, context):
-        vpk_path = Path(self.filepath)
-        assert vpk_path.is_file(), 'Not a file'
-
-        ContentManager().scan_for_content(vpk_path.parent)
-        ContentManager().scan_for_content(vpk_path)
-        world_file = ContentManager().find_file(f'maps/{vpk_path.stem}/world.vwrld_c')
-        assert world_file is not None, "Failed to find world file in selected VPK"
-        world = ValveCompiledWorldLoader(world_file, invert_uv=self.invert_uv, scale=self.scale)
-        world.load(vpk_path.stem)
+        try:
+            vpk_path = Path(self.filepath)
+            assert vpk_path.is_file(), 'Not a file'
+
+            ContentManager().scan_for_content(vpk_path.parent)
+            ContentManager().scan_for_content(vpk_path)
+            world_file = ContentManager().find_file(f'maps/{vpk_path.stem}/world.vwrld_c')
+            assert world_file is not None, "Failed to find world file in selected VPK"
+            world = ValveCompiledWorldLoader(world_file, invert_uv=self.invert_uv, scale=self.scale)
+            world.load(vpk_path.stem)
+        finally:
+            clear_texture_cache()
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -129,16 +137,18 @@ class SOURCEIO_OT_VMATImport(bpy.types.Operator):
     filter_glob: StringProperty(default="*.vmat_c", options={'HIDDEN'})
 
     def execute(self, context):
-
-        if Path(self.filepath).is_file():
-            directory = Path(self.filepath).parent.absolute()
-        else:
-            directory = Path(self.filepath).absolute()
-        ContentManager().scan_for_content(directory)
-        for n, file in enumerate(self.files):
-            print(f"Loading {n + 1}/{len(self.files)}")
-            material = ValveCompiledMaterialLoader(str(directory / file.name))
-            material.load()
+        try:
+            if Path(self.filepath).is_file():
+                directory = Path(self.filepath).parent.absolute()
+            else:
+                directory = Path(self.filepath).absolute()
+            ContentManager().scan_for_content(directory)
+            for n, file in enumerate(self.files):
+                print(f"Loading {n + 1}/{len(self.files)}")
+                material = ValveCompiledMaterialLoader(str(directory / file.name))
+                material.load()
+        finally:
+            clear_texture_cache()
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -1,12 +1,10 @@
-import math
-import sys
 import warnings
 from pathlib import Path
+from typing import List, Optional
 
 import bpy
 
 import numpy as np
-from mathutils import Vector, Matrix, Euler, Quaternion
 
 from .. import FileImport
 from ..common import get_slice, merge_meshes
@@ -27,26 +25,45 @@ from ....shared.model_container import Source1ModelContainer
 from ....material_loader.material_loader import Source1MaterialLoader
 from ....material_loader.shaders.source1_shader_base import Source1ShaderBase
 from ....utils.utils import get_material
-from .....library.utils.math_utilities import euler_to_quat
+from .....library.utils.math_utilities import euler_to_matrix_v
 # from .....library.utils.pylib_loader import source1
 
 log_manager = SLoggingManager()
 logger = log_manager.get_logger('Source1::ModelLoader')
 
 
+def _loop_uvs(uvs: np.ndarray, vertex_indices: np.ndarray):
+    loop_uvs = np.empty((len(vertex_indices), 2), np.float32)
+    src = uvs[vertex_indices]
+    loop_uvs[:, 0] = src[:, 0]
+    np.subtract(1, src[:, 1], out=loop_uvs[:, 1])
+    return loop_uvs.ravel()
+
+
+def _material_names(mdl: MdlV49, model_stem: str, unique_material_names=False):
+    material_names = [material.name[-63:] for material in mdl.materials]
+    if unique_material_names:
+        material_names = [f"{model_stem}_{material_name}"[-63:] for material_name in material_names]
+    return material_names
+
+
 def collect_full_material_names(mdl: MdlV49):
     content_manager = ContentManager()
     full_mat_names = {}
-    for material_path in mdl.materials_paths:
-        for material in mdl.materials:
-            real_material_path = content_manager.find_material(Path(material_path) / material.name)
-            if real_material_path is not None:
-                full_mat_names[material] = str(Path(material_path) / material.name)
+    material_paths = [Path(material_path) for material_path in mdl.materials_paths]
+    for material in mdl.materials:
+        for material_path in material_paths:
+            full_material_path = material_path / material.name
+            if content_manager.find_material(full_material_path) is not None:
+                full_mat_names[material] = str(full_material_path)
+                break
     return full_mat_names
 
 
-def create_armature(mdl: MdlV49, scale=1.0):
-    model_name = Path(mdl.header.name).stem
+def create_armature(mdl: MdlV49, scale=1.0, bone_names: Optional[List[str]] = None,
+                    model_name: Optional[str] = None):
+    if model_name is None:
+        model_name = Path(mdl.header.name).stem
     armature = bpy.data.armatures.new(f"{model_name}_ARM_DATA")
     armature_obj = bpy.data.objects.new(f"{model_name}_ARM", armature)
     armature_obj['MODE'] = 'SourceIO'
@@ -56,28 +73,36 @@ def create_armature(mdl: MdlV49, scale=1.0):
     armature_obj.select_set(True)
     bpy.context.view_layer.objects.active = armature_obj
 
+    if bone_names is None:
+        bone_names = [bone.name[-63:] for bone in mdl.bones]
+
+    bone_count = len(mdl.bones)
+    local_matrices = np.tile(np.eye(4, dtype=np.float32), (bone_count, 1, 1))
+    local_matrices[:, :3, :3] = euler_to_matrix_v(np.array([bone.rotation for bone in mdl.bones], np.float32))
+    local_matrices[:, :3, 3] = np.array([bone.position for bone in mdl.bones], np.float32) * scale
+    # Parents always precede their children in MDL bone order
+    world_matrices = np.empty_like(local_matrices)
+    for n, se_bone in enumerate(mdl.bones):
+        if se_bone.parent_bone_index != -1:
+            world_matrices[n] = world_matrices[se_bone.parent_bone_index] @ local_matrices[n]
+        else:
+            world_matrices[n] = local_matrices[n]
+
+    # Blender bones point along their local Y axis, Z fixes the roll; length is kept at `scale`
+    heads = world_matrices[:, :3, 3]
+    tails = heads + world_matrices[:, :3, 1] * scale
+    roll_axes = world_matrices[:, :3, 2]
+
     bpy.ops.object.mode_set(mode='EDIT')
-    bl_bones = []
-    for bone in mdl.bones:
-        bl_bone = armature.edit_bones.new(bone.name[-63:])
-        bl_bones.append(bl_bone)
+    bl_bones = [armature.edit_bones.new(bone_name) for bone_name in bone_names]
 
-    for bl_bone, s_bone in zip(bl_bones, mdl.bones):
+    for n, (bl_bone, s_bone) in enumerate(zip(bl_bones, mdl.bones)):
         if s_bone.parent_bone_index != -1:
             bl_parent = bl_bones[s_bone.parent_bone_index]
             bl_bone.parent = bl_parent
-        bl_bone.tail = (Vector([0, 0, 1]) * scale) + bl_bone.head
-
-    bpy.ops.object.mode_set(mode='POSE')
-    for n, se_bone in enumerate(mdl.bones):
-        bl_bone = armature_obj.pose.bones.get(se_bone.name[-63:])
-        pos = Vector(se_bone.position) * scale
-        rot = Euler(se_bone.rotation)
-        mat = Matrix.Translation(pos) @ rot.to_matrix().to_4x4()
-        bl_bone.matrix_basis.identity()
-
-        bl_bone.matrix = bl_bone.parent.matrix @ mat if bl_bone.parent else mat
-    bpy.ops.pose.armature_apply()
+        bl_bone.head = heads[n]
+        bl_bone.tail = tails[n]
+        bl_bone.align_roll(roll_axes[n])
     bpy.ops.object.mode_set(mode='OBJECT')
 
     bpy.context.scene.collection.objects.unlink(armature_obj)
@@ -93,10 +118,14 @@ def import_model(file_list: FileImport,
 
     vvd = Vvd(file_list.vvd_file)
     vvd.read()
+    extra_uvs = {extra_type: extra_data.reshape((-1, 2)) for extra_type, extra_data in vvd.extra_data.items()}
     vtx = Vtx(file_list.vtx_file)
     vtx.read()
 
     container = Source1ModelContainer(mdl, vvd, vtx, file_list)
+    model_stem = Path(mdl.header.name).stem
+    material_names = _material_names(mdl, model_stem, unique_material_names)
+    bone_names = [bone.name[-63:] for bone in mdl.bones]
 
     desired_lod = 0
     all_vertices = vvd.lod_data[desired_lod]
@@ -108,7 +137,7 @@ def import_model(file_list: FileImport,
         vac.process_data()
 
     if not static_prop:
-        armature = create_armature(mdl, scale)
+        armature = create_armature(mdl, scale, bone_names, model_stem)
         container.armature = armature
 
     for vtx_body_part, body_part in zip(vtx.body_parts, mdl.body_parts):
@@ -150,7 +179,7 @@ def import_model(file_list: FileImport,
             container.objects.append(mesh_obj)
             container.bodygroups[body_part.name].append(mesh_obj)
             mesh_obj['unique_material_names'] = unique_material_names
-            mesh_obj['prop_path'] = Path(mdl.header.name).stem
+            mesh_obj['prop_path'] = model_stem
 
             if used_copy:
                 continue
@@ -162,49 +191,61 @@ def import_model(file_list: FileImport,
             vertices = model_vertices[vtx_vertices]
             vertices_vertex = vertices['vertex']
 
-            mesh_data.from_pydata(vertices_vertex * scale, [], np.flip(indices_array).reshape((-1, 3)).tolist())
-            mesh_data.update()
+            tris = np.ascontiguousarray(indices_array.reshape((-1, 3))[:, ::-1], dtype=np.int32)
+            mesh_data.vertices.add(len(vertices_vertex))
+            mesh_data.vertices.foreach_set('co', (vertices_vertex * scale).astype(np.float32, copy=False).ravel())
+            mesh_data.loops.add(tris.size)
+            mesh_data.polygons.add(len(tris))
+            mesh_data.loops.foreach_set('vertex_index', tris.ravel())
+            mesh_data.polygons.foreach_set('loop_start', np.arange(0, tris.size, 3, dtype=np.int32))
+            mesh_data.polygons.foreach_set('loop_total', np.full(len(tris), 3, dtype=np.int32))
+            mesh_data.update(calc_edges=True)
 
             mesh_data.polygons.foreach_set("use_smooth", np.ones(len(mesh_data.polygons), np.uint32))
             mesh_data.normals_split_custom_set_from_vertices(vertices['normal'])
             mesh_data.use_auto_smooth = True
 
-            material_remapper = np.zeros((material_indices_array.max() + 1,), dtype=np.uint32)
-            for mat_id in np.unique(material_indices_array):
-                mat_name = mdl.materials[mat_id].name
-                if unique_material_names:
-                    mat_name = f"{Path(mdl.header.name).stem}_{mat_name[-63:]}"[-63:]
-                else:
-                    mat_name = mat_name[-63:]
-                material_remapper[mat_id] = get_material(mat_name, mesh_obj)
+            material_ids, material_inverse = np.unique(material_indices_array, return_inverse=True)
+            material_slots = np.empty(len(material_ids), dtype=np.int32)
+            for n, mat_id in enumerate(material_ids):
+                material_slots[n] = get_material(material_names[mat_id], mesh_obj)
 
-            mesh_data.polygons.foreach_set('material_index', material_remapper[material_indices_array[::-1]].tolist())
+            mesh_data.polygons.foreach_set('material_index', material_slots[material_inverse.ravel()])
 
-            vertex_indices = np.zeros((len(mesh_data.loops, )), dtype=np.uint32)
+            vertex_indices = np.empty(len(mesh_data.loops), dtype=np.int32)
             mesh_data.loops.foreach_get('vertex_index', vertex_indices)
 
             uv_data = mesh_data.uv_layers.new()
-            uvs = vertices['uv']
-            uvs[:, 1] = 1 - uvs[:, 1]
-            uv_data.data.foreach_set('uv', uvs[vertex_indices].flatten())
-
-            if vvd.extra_data:
-                for extra_type, extra_data in vvd.extra_data.items():
-                    extra_data = extra_data.reshape((-1, 2))
-                    extra_uv = get_slice(extra_data, model.vertex_offset, model.vertex_count)
-                    extra_uv = extra_uv[vtx_vertices]
-                    uv_data = mesh_data.uv_layers.new(name=extra_type.name)
-                    extra_uv[:, 1] = 1 - extra_uv[:, 1]
-                    uv_data.data.foreach_set('uv', extra_uv[vertex_indices].flatten())
+            uv_data.data.foreach_set('uv', _loop_uvs(vertices['uv'], vertex_indices))
 
-            if not static_prop:
-                weight_groups = {bone.name: mesh_obj.vertex_groups.new(name=bone.name) for bone in mdl.bones}
+            for extra_type, extra_data in extra_uvs.items():
+                extra_uv = get_slice(extra_data, model.vertex_offset, model.vertex_count)
+                uv_data = mesh_data.uv_layers.new(name=extra_type.name)
+                uv_data.data.foreach_set('uv', _loop_uvs(extra_uv[vtx_vertices], vertex_indices))
 
-                for n, (bone_indices, bone_weights) in enumerate(zip(vertices['bone_id'], vertices['weight'])):
-                    for bone_index, weight in zip(bone_indices, bone_weights):
-                        if weight > 0:
-                            bone_name = mdl.bones[bone_index].name
-                            weight_groups[bone_name].add([n], weight, 'REPLACE')
+            if not static_prop:
+                weight_groups = {bone_name: mesh_obj.vertex_groups.new(name=bone_name) for bone_name in bone_names}
+
+                # Group (vertex, bone, weight) triplets by bone and weight to add each group with a single call
+                bone_indices = vertices['bone_id'].ravel()
+                bone_weights = vertices['weight'].ravel()
+                vertex_ids = np.repeat(np.arange(len(vertices), dtype=np.int32), vertices['weight'].shape[1])
+                mask = bone_weights > 0
+                bone_indices, bone_weights, vertex_ids = bone_indices[mask], bone_weights[mask], vertex_ids[mask]
+                if bone_weights.size:
+                    # Same bone listed twice for a vertex: the last entry wins, as with sequential REPLACE adds
+                    pair_keys = vertex_ids.astype(np.int64) * 256 + bone_indices
+                    _, last = np.unique(pair_keys[::-1], return_index=True)
+                    keep = bone_weights.size - 1 - last
+                    bone_indices, bone_weights, vertex_ids = bone_indices[keep], bone_weights[keep], vertex_ids[keep]
+                    order = np.lexsort((bone_weights, bone_indices))
+                    bone_indices, bone_weights, vertex_ids = bone_indices[order], bone_weights[order], vertex_ids[order]
+                    run_starts = np.flatnonzero((np.diff(bone_indices) != 0) | (np.diff(bone_weights) != 0)) + 1
+                    run_bounds = np.concatenate(([0], run_starts, [bone_weights.size]))
+                    for start, end in zip(run_bounds[:-1], run_bounds[1:]):
+                        bone_name = bone_names[bone_indices[start]]
+                        weight_groups[bone_name].add(vertex_ids[start:end].tolist(), float(bone_weights[start]),
+                                                     'REPLACE')
 
             if not static_prop:
                 flexes = []
@@ -214,12 +255,18 @@ def import_model(file_list: FileImport,
 
                 if flexes:
                     mesh_obj.shape_key_add(name='base')
+                    # Base positions and stereo balance only depend on the model, not on the flex
+                    model_vertices = (vertices_vertex * scale).astype(np.float32, copy=False)
+                    if create_drivers:
+                        balance_width = (model_vertices.max() - model_vertices.min()) * (1 - (99.3 / 100))
+                        balance = np.clip((-model_vertices[:, 0] / balance_width / 2) + 0.5, 0, 1)
+                        balance = balance.astype(np.float32, copy=False)[:, None]
+                        p_balance = 1 - balance
+                    flex_vertices = np.empty_like(model_vertices)
                     for flex_name, flex_desc in flexes:
                         vertex_animation = vac.vertex_cache[flex_name]
                         flex_delta = get_slice(vertex_animation, model.vertex_offset, model.vertex_count)
-                        flex_delta = flex_delta[vtx_vertices] * scale
-                        model_vertices = get_slice(all_vertices['vertex'], model.vertex_offset, model.vertex_count)
-                        model_vertices = model_vertices[vtx_vertices] * scale
+                        flex_delta = (flex_delta[vtx_vertices] * scale).astype(np.float32, copy=False)
 
                         if create_drivers and flex_desc.partner_index:
                             partner_name = mdl.flex_names[flex_desc.partner_index]
@@ -228,25 +275,24 @@ def import_model(file_list: FileImport,
                             shape_key = (mesh_data.shape_keys.key_blocks.get(flex_name, None) or
                                          mesh_obj.shape_key_add(name=flex_name))
 
-                            balance = model_vertices[:, 0]
-                            balance_width = (model_vertices.max() - model_vertices.min()) * (1 - (99.3 / 100))
-                            balance = np.clip((-balance / balance_width / 2) + 0.5, 0, 1)
-
-                            flex_vertices = (flex_delta * balance[:, None]) + model_vertices
-                            shape_key.data.foreach_set("co", flex_vertices.reshape(-1))
+                            np.multiply(flex_delta, balance, out=flex_vertices)
+                            np.add(flex_vertices, model_vertices, out=flex_vertices)
+                            shape_key.data.foreach_set("co", flex_vertices.ravel())
 
-                            p_balance = 1 - balance
-                            p_flex_vertices = (flex_delta * p_balance[:, None]) + model_vertices
-                            partner_shape_key.data.foreach_set("co", p_flex_vertices.reshape(-1))
+                            np.multiply(flex_delta, p_balance, out=flex_vertices)
+                            np.add(flex_vertices, model_vertices, out=flex_vertices)
+                            partner_shape_key.data.foreach_set("co", flex_vertices.ravel())
                         else:
                             shape_key = mesh_data.shape_keys.key_blocks.get(flex_name, None) or mesh_obj.shape_key_add(
                                 name=flex_name)
 
-                            shape_key.data.foreach_set("co", (flex_delta + model_vertices).reshape(-1))
+                            np.add(flex_delta, model_vertices, out=flex_vertices)
+                            shape_key.data.foreach_set("co", flex_vertices.ravel())
                     if create_drivers:
                         create_flex_drivers(mesh_obj, mdl)
     if mdl.attachments:
-        attachments = create_attachments(mdl, armature if not static_prop else container.objects[0], scale)
+        attachments = create_attachments(mdl, armature if not static_prop else container.objects[0], scale,
+                                         bone_names)
         container.attachments.extend(attachments)
 
     return container
@@ -268,35 +314,31 @@ def create_flex_drivers(obj, mdl: MdlV49):
 
     st = '\n    '
 
+    flex_controllers = {flex_controller.name: flex_controller for flex_controller in mdl.flex_controllers}
     for flex_controller_ui in mdl.flex_ui_controllers:
         cont: SourceIO_PG_FlexController = data.flex_controllers.add()
 
         if flex_controller_ui.nway_controller:
             nway_cont: SourceIO_PG_FlexController = data.flex_controllers.add()
             nway_cont.stereo = False
-            multi_controller = next(filter(lambda a: a.name == flex_controller_ui.nway_controller, mdl.flex_controllers)
-                                    )
+            multi_controller = flex_controllers[flex_controller_ui.nway_controller]
             nway_cont.name = flex_controller_ui.nway_controller
             nway_cont.set_from_controller(multi_controller)
 
         if flex_controller_ui.stereo:
-            left_controller = next(
-                filter(lambda a: a.name == flex_controller_ui.left_controller, mdl.flex_controllers)
-            )
-            right_controller = next(
-                filter(lambda a: a.name == flex_controller_ui.right_controller, mdl.flex_controllers)
-            )
+            left_controller = flex_controllers[flex_controller_ui.left_controller]
+            right_controller = flex_controllers[flex_controller_ui.right_controller]
             cont.stereo = True
             cont.name = flex_controller_ui.name
             assert left_controller.max == right_controller.max
             assert left_controller.min == right_controller.min
             cont.set_from_controller(left_controller)
         else:
-            controller = next(filter(lambda a: a.name == flex_controller_ui.controller, mdl.flex_controllers))
+            controller = flex_controllers[flex_controller_ui.controller]
             cont.stereo = False
             cont.name = flex_controller_ui.name
             cont.set_from_controller(controller)
-    blender_py_file = """
+    blender_py_parts = ["""
 import bpy
 
 def rclamped(val, a, b, c, d):
@@ -349,28 +391,32 @@ bpy.app.driver_namespace["dom"] = dom
 bpy.app.driver_namespace["nway"] = nway
 bpy.app.driver_namespace["rclamped"] = rclamped
 
-    """
+    """]
+    flex_names = set(all_exprs) | {shape_key.name for shape_key in shape_key_block.key_blocks}
+    driver_names = {flex_name: f'{flex_name}_driver'.replace(' ', '_') for flex_name in flex_names}
+
     for flex_name, (expr, inputs) in all_exprs.items():
-        driver_name = f'{flex_name}_driver'.replace(' ', '_')
+        driver_name = driver_names[flex_name]
         if driver_name in globals():
             continue
 
         input_definitions = []
         for inp in inputs:
             input_name = inp[0]
+            input_var = input_name.replace(" ", "_")
             if inp[1] in ('fetch1', '2WAY1', '2WAY0', 'NWAY', 'DUE'):
                 if 'left_' in input_name:
                     input_definitions.append(
-                        f'{inp[0].replace(" ", "_")} = obj_data.flex_controllers["{input_name.replace("left_", "")}"].value_left')
+                        f'{input_var} = obj_data.flex_controllers["{input_name.replace("left_", "")}"].value_left')
                 elif 'right_' in input_name:
                     input_definitions.append(
-                        f'{inp[0].replace(" ", "_")} = obj_data.flex_controllers["{input_name.replace("right_", "")}"].value_right')
+                        f'{input_var} = obj_data.flex_controllers["{input_name.replace("right_", "")}"].value_right')
                 else:
                     input_definitions.append(
-                        f'{inp[0].replace(" ", "_")} = obj_data.flex_controllers["{inp[0]}"].value')
+                        f'{input_var} = obj_data.flex_controllers["{input_name}"].value')
             elif inp[1] == 'fetch2':
                 input_definitions.append(
-                    f'{inp[0].replace(" ", "_")} = obj_data.shape_keys.key_blocks["{input_name}"].value')
+                    f'{input_var} = obj_data.shape_keys.key_blocks["{input_name}"].value')
             else:
                 raise NotImplementedError(f'"{inp[1]}" is not supported')
         print(f"{flex_name} = {expr}")
@@ -381,14 +427,16 @@ def {driver_name}(obj_data):
 bpy.app.driver_namespace["{driver_name}"] = {driver_name}
 
 """
-        blender_py_file += template_function
+        blender_py_parts.append(template_function)
 
+    drivers = shape_key_block.animation_data.drivers if shape_key_block.animation_data else None
     for shape_key in shape_key_block.key_blocks:
 
         flex_name = shape_key.name
 
         if flex_name == 'base':
             continue
+        driver_name = driver_names[flex_name]
         if flex_name not in all_exprs:
             warnings.warn(f'Rule for {flex_name} not found! Generating basic rule.')
             expr, inputs = _parse_simple_flex(flex_name) or (None, None)
@@ -400,21 +448,29 @@ bpy.app.driver_namespace["{driver_name}"] = {driver_name}
                 cont.value_min = 0
                 cont.value_max = 1
                 template_function = f"""
-def {flex_name.replace(' ', '_')}_driver(obj_data):
+def {driver_name}(obj_data):
     return obj_data.flex_controllers["{flex_name}"].value
-bpy.app.driver_namespace["{flex_name.replace(' ', '_')}_driver"] = {flex_name.replace(' ', '_')}_driver
+bpy.app.driver_namespace["{driver_name}"] = {driver_name}
 
                                 """
-                blender_py_file += template_function
+                blender_py_parts.append(template_function)
             else:
                 template_function = f"""
-def {flex_name.replace(' ', '_')}_driver(obj_data):
+def {driver_name}(obj_data):
     {st.join(inputs)}
     return {expr}
-bpy.app.driver_namespace["{flex_name.replace(' ', '_')}_driver"] = {flex_name.replace(' ', '_')}_driver
+bpy.app.driver_namespace["{driver_name}"] = {driver_name}
 
                 """
-                blender_py_file += template_function
+                blender_py_parts.append(template_function)
+
+        expression = f"{driver_name}(obj_data)"
+        if drivers is not None:
+            fcurve = drivers.find(shape_key.path_from_id("value"))
+            if fcurve is not None and fcurve.driver.expression == expression:
+                var = fcurve.driver.variables.get('obj_data')
+                if var is not None and var.targets[0].id == obj:
+                    continue
 
         shape_key.driver_remove("value")
         fcurve = shape_key.driver_add("value")
@@ -422,7 +478,7 @@ bpy.app.driver_namespace["{flex_name.replace(' ', '_')}_driver"] = {flex_name.re
 
         driver = fcurve.driver
         driver.type = 'SCRIPTED'
-        driver.expression = f"{flex_name.replace(' ', '_')}_driver(obj_data)"
+        driver.expression = expression
         var = driver.variables.new()
         var.name = 'obj_data'
         var.targets[0].id_type = 'OBJECT'
@@ -430,18 +486,18 @@ bpy.app.driver_namespace["{flex_name.replace(' ', '_')}_driver"] = {flex_name.re
         var.targets[0].data_path = f"data"
 
     driver_file = bpy.data.texts.new(f'{mdl.header.name}.py')
-    driver_file.write(blender_py_file)
+    driver_file.write(''.join(blender_py_parts))
     driver_file.use_module = True
 
 
-def create_attachments(mdl: MdlV49, armature: bpy.types.Object, scale):
+def create_attachments(mdl: MdlV49, armature: bpy.types.Object, scale, bone_names: Optional[List[str]] = None):
+    if bone_names is None:
+        bone_names = [bone.name[-63:] for bone in mdl.bones]
     attachments = []
-    for attachment in mdl.attachments:
+    positions = np.array([attachment.pos for attachment in mdl.attachments], np.float32) * scale
+    rotations = np.array([attachment.rot for attachment in mdl.attachments], np.float32)
+    for attachment, pos, rot in zip(mdl.attachments, positions, rotations):
         empty = bpy.data.objects.new(attachment.name, None)
-        pos = Vector(attachment.pos) * scale
-        rot = Euler(attachment.rot)
-
-        empty.matrix_basis.identity()
         empty.scale *= scale
         empty.location = pos
         empty.rotation_euler = rot
@@ -449,7 +505,7 @@ def create_attachments(mdl: MdlV49, armature: bpy.types.Object, scale):
         if armature.type == 'ARMATURE':
             modifier = empty.constraints.new(type="CHILD_OF")
             modifier.target = armature
-            modifier.subtarget = mdl.bones[attachment.parent_bone].name
+            modifier.subtarget = bone_names[attachment.parent_bone]
             modifier.inverse_matrix.identity()
 
         attachments.append(empty)
@@ -459,12 +515,9 @@ def create_attachments(mdl: MdlV49, armature: bpy.types.Object, scale):
 
 def import_materials(mdl: MdlV49, unique_material_names=False, use_bvlg=False):
     content_manager = ContentManager()
-    for material in mdl.materials:
-
-        if unique_material_names:
-            mat_name = f"{Path(mdl.header.name).stem}_{material.name[-63:]}"[-63:]
-        else:
-            mat_name = material.name[-63:]
+    material_paths = [Path(mat_path) for mat_path in mdl.materials_paths]
+    material_names = _material_names(mdl, Path(mdl.header.name).stem, unique_material_names)
+    for material, mat_name in zip(mdl.materials, material_names):
         material_eyeball = None
         for eyeball in mdl.eyeballs:
             if eyeball.material.name == material.name:
@@ -475,8 +528,8 @@ def import_materials(mdl: MdlV49, unique_material_names=False, use_bvlg=False):
                 logger.info(f'Skipping loading of {mat_name} as it already loaded')
                 continue
         material_path = None
-        for mat_path in mdl.materials_paths:
-            material_path = content_manager.find_material(Path(mat_path) / material.name)
+        for mat_path in material_paths:
+            material_path = content_manager.find_material(mat_path / material.name)
             if material_path:
                 break
         if material_path:
@@ -492,6 +545,8 @@ def import_materials(mdl: MdlV49, unique_material_names=False, use_bvlg=False):
 
 
 def import_animations(mdl_file: ByteIO, mdl: MdlV49, armature, scale):
+    from mathutils import Vector, Matrix, Quaternion
+    # Animation import is disabled until MdlResource support is restored
     return
     bpy.ops.object.select_all(action="DESELECT")
     armature.select_set(True)
@@ -1,7 +1,4 @@
-from enum import IntEnum
-
-
-class SteamAppId(IntEnum):
+class SteamAppId:
     HALF_LIFE_2 = 220
     HALF_LIFE_2_EP_1 = 380
     HALF_LIFE_2_EP_2 = 420
@@ -186,6 +186,23 @@ def euler_to_matrix(theta):
     return np.dot(r_z, np.dot(r_y, r_x))
 
 
+def euler_to_matrix_v(thetas: np.ndarray):
+    """Vectorized euler_to_matrix, converts (N, 3) XYZ euler angles into (N, 3, 3) rotation matrices."""
+    sin_x, sin_y, sin_z = np.sin(thetas).T
+    cos_x, cos_y, cos_z = np.cos(thetas).T
+    matrices = np.empty((len(thetas), 3, 3), dtype=thetas.dtype)
+    matrices[:, 0, 0] = cos_z * cos_y
+    matrices[:, 0, 1] = cos_z * sin_y * sin_x - sin_z * cos_x
+    matrices[:, 0, 2] = cos_z * sin_y * cos_x + sin_z * sin_x
+    matrices[:, 1, 0] = sin_z * cos_y
+    matrices[:, 1, 1] = sin_z * sin_y * sin_x + cos_z * cos_x
+    matrices[:, 1, 2] = sin_z * sin_y * cos_x - cos_z * sin_x
+    matrices[:, 2, 0] = -sin_y
+    matrices[:, 2, 1] = cos_y * sin_x
+    matrices[:, 2, 2] = cos_y * cos_x
+    return matrices
+
+
 def euler_to_quat(euler: np.ndarray):
     euler *= 0.5
     roll, pitch, yaw = euler